@@ -1,25 +1,61 @@
 from django.contrib import admin
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from .models import ProcessedFeed, OriginalFeed, Filter, Article, AppSetting, Digest, FilterGroup, Tag
 from django.utils.html import format_html
 from django.urls import reverse
-from django.db.models import Count
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from .forms import FilterForm, ReadOnlyArticleForm, ProcessedFeedAdminForm
 from django.contrib.auth.models import User, Group
 from django.core.management import call_command
 from huey.contrib.djhuey import task
 from nested_admin.nested import NestedModelAdmin, NestedTabularInline
-from .tasks import async_update_feeds_and_digest, clean_old_articles
+from .tasks import async_update_feeds_and_digest_bulk, clean_old_articles_bulk
+
+
+class OnlyFieldsChangeList(ChangeList):
+    # Load only the columns the changelist renders, change views still get full rows
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        return queryset.only(*self.model_admin.changelist_only_fields)
+
+class PkCountPaginator(Paginator):
+    # Count primary keys only, so searches across relations that need DISTINCT do not
+    # carry the annotated counts and every selected column into the COUNT(*) subquery
+    @cached_property
+    def count(self):
+        return self.object_list.values('pk').count()
+
+def _through_count(through, fk):
+    # Number of m2m through rows whose fk points at the outer row, 0 when there are none.
+    # A correlated subquery keeps the main query free of JOIN + GROUP BY, so the
+    # paginator's COUNT(*) stays a plain count over the table
+    counts = through.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts), 0)
+
+class ChangeListOnlyFieldsMixin:
+    changelist_only_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        if self.changelist_only_fields:
+            return OnlyFieldsChangeList
+        return super().get_changelist(request, **kwargs)
 
 def update_selected_feeds(modeladmin, request, queryset):
-    for feed in queryset:
-        async_update_feeds_and_digest(feed.name)
-        # If you select a feed to update, you are forcely generating a digest for it
-        modeladmin.message_user(request, f"Feed update tasks have been queued for feed: {feed.name}")
+    feed_names = list(queryset.values_list('name', flat=True))
+    # If you select a feed to update, you are forcely generating a digest for it
+    async_update_feeds_and_digest_bulk(feed_names)
+    modeladmin.message_user(request, f"Feed update tasks have been queued for {len(feed_names)} feed(s): {', '.join(feed_names)}")
 
 def clean_selected_feeds_articles(modeladmin, request, queryset):
-    for feed in queryset:
-        clean_old_articles(feed.id)
-        modeladmin.message_user(request, f"Cleaned old articles from feed: {feed.title}")
+    feeds = list(queryset.values_list('id', 'title'))
+    clean_old_articles_bulk([feed_id for feed_id, _ in feeds])
+    modeladmin.message_user(request, f"Cleaning old articles from {len(feeds)} feed(s): {', '.join(title for _, title in feeds)}")
 
 clean_selected_feeds_articles.short_description = "Clean old articles for selected feeds"
 update_selected_feeds.short_description = "Update selected feeds"
@@ -38,7 +74,11 @@ class ArticleInline(admin.TabularInline):
     model = Article
     form = ReadOnlyArticleForm
     extra = 0
-    readonly_fields = [field.name for field in Article._meta.fields if field.name != 'content']
+    readonly_fields = tuple(field.name for field in Article._meta.fields if field.name != 'content')
+
+    def get_queryset(self, request):
+        # original_feed is one of the readonly fields, fetch it with the articles
+        return super().get_queryset(request).select_related('original_feed')
 
     def has_add_permission(self, request, obj=None):
         return False
@@ -57,12 +97,14 @@ class HasAnyOriginalFeedListFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
+        # EXISTS on the through table avoids the LEFT JOIN through the m2m
+        has_feeds = Exists(ProcessedFeed.feeds.through.objects.filter(processedfeed=OuterRef('pk')))
         if self.value() == 'yes':
-            return queryset.exclude(feeds=None)
+            return queryset.filter(has_feeds)
         if self.value() == 'no':
-            return queryset.filter(feeds=None)
+            return queryset.filter(~has_feeds)
 
-class ProcessedFeedAdmin(NestedModelAdmin):
+class ProcessedFeedAdmin(ChangeListOnlyFieldsMixin, NestedModelAdmin):
     form = ProcessedFeedAdminForm
     inlines = [FilterGroupInline]
     # rename articles_to_summarize_per_interval to Summarize per Update in list display
@@ -70,16 +112,16 @@ class ProcessedFeedAdmin(NestedModelAdmin):
         return obj.articles_to_summarize_per_interval
     summarize_per_update.short_description = 'Summarize per Update'
 
+    # An emoji description to show if the digest/entries are enabled, keyed on (toggle_digest, toggle_entries)
+    DIGEST_ENTRIES_STATUS = {
+        (True, True): '✅/✅',
+        (True, False): '✅/❌',
+        (False, True): '❌/✅',
+        (False, False): '❌/❌',
+    }
+
     def toggle_digest_and_update(self, obj):
-        # An emoji description to show if the digest/entries are enabled
-        if obj.toggle_digest and obj.toggle_entries:
-            return '✅/✅'
-        elif obj.toggle_digest and not obj.toggle_entries:
-            return '✅/❌'
-        elif not obj.toggle_digest and obj.toggle_entries:
-            return '❌/✅'
-        else:
-            return '❌/❌'
+        return self.DIGEST_ENTRIES_STATUS[(obj.toggle_digest, obj.toggle_entries)]
     toggle_digest_and_update.short_description = 'Digest/Entries'
 
     list_display = ('name', 'summarize_per_update', 'subscription_link', 'original_feed_count', 'toggle_digest_and_update')
@@ -88,11 +130,16 @@ class ProcessedFeedAdmin(NestedModelAdmin):
     list_filter = ('articles_to_summarize_per_interval', 'summary_language', 'model', HasAnyOriginalFeedListFilter, 'toggle_digest', 'toggle_entries', 'digest_frequency', 'use_ai_digest', 'digest_model')
     actions = [update_selected_feeds]
     autocomplete_fields = ['feeds']
+    show_full_result_count = False
+    paginator = PkCountPaginator
+    list_per_page = 50
+    # Skip the prompt text columns, the list only shows these
+    changelist_only_fields = ('name', 'articles_to_summarize_per_interval', 'toggle_digest', 'toggle_entries')
 
     def get_queryset(self, request):
         # Annotate each ProcessedFeed object with the count of related OriginalFeeds
         queryset = super().get_queryset(request)
-        queryset = queryset.annotate(_original_feed_count=Count('feeds'))
+        queryset = queryset.annotate(_original_feed_count=_through_count(ProcessedFeed.feeds.through, 'processedfeed'))
         return queryset
 
     def original_feed_count(self, obj):
@@ -140,20 +187,58 @@ class IncludedInProcessedFeedListFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
+        # EXISTS on the through table needs neither a JOIN nor DISTINCT
+        in_processed_feed = Exists(ProcessedFeed.feeds.through.objects.filter(originalfeed=OuterRef('pk')))
         if self.value() == 'yes':
-            return queryset.filter(processed_feeds__isnull=False).distinct()
+            return queryset.filter(in_processed_feed)
         if self.value() == 'no':
-            return queryset.filter(processed_feeds__isnull=True)
+            return queryset.filter(~in_processed_feed)
+
+# Other worker processes only see renamed, added or deleted feeds once the cached choices expire
+PROCESSED_FEED_NAME_CHOICES_CACHE_KEY = 'processed_feed_name_choices'
+PROCESSED_FEED_NAME_CHOICES_CACHE_TIMEOUT = 60
+
+def processed_feed_name_choices():
+    return cache.get_or_set(
+        PROCESSED_FEED_NAME_CHOICES_CACHE_KEY,
+        lambda: tuple(ProcessedFeed.objects.order_by('name').values_list('name', 'name')),
+        PROCESSED_FEED_NAME_CHOICES_CACHE_TIMEOUT,
+    )
+
+@receiver([post_save, post_delete], sender=ProcessedFeed)
+def clear_processed_feed_name_choices(sender, **kwargs):
+    cache.delete(PROCESSED_FEED_NAME_CHOICES_CACHE_KEY)
+
+class ProcessedFeedNameListFilter(admin.SimpleListFilter):
+    title = 'Processed feed'
+    # Same parameter as the previous 'processed_feeds__name' field filter, so old links keep working
+    parameter_name = 'processed_feeds__name'
+
+    def lookups(self, request, model_admin):
+        # Cached for a minute, and cleared when a ProcessedFeed is saved or deleted
+        return processed_feed_name_choices()
+
+    def queryset(self, request, queryset):
+        # EXISTS instead of joining through the m2m, which also needed DISTINCT
+        if self.value():
+            return queryset.filter(Exists(ProcessedFeed.feeds.through.objects.filter(
+                originalfeed=OuterRef('pk'), processedfeed__name=self.value()
+            )))
 
-class OriginalFeedAdmin(admin.ModelAdmin):
+class OriginalFeedAdmin(ChangeListOnlyFieldsMixin, admin.ModelAdmin):
     inlines = [ArticleInline]
     list_display = ('title', 'valid', 'url', 'processed_feeds_count')
     search_fields = ('title', 'url') 
+    # Skip the extra unfiltered COUNT(*) when a search or filter is active
+    show_full_result_count = False
+    paginator = PkCountPaginator
+    list_per_page = 50
+    changelist_only_fields = ('title', 'valid', 'url')
 
     def get_queryset(self, request):
         # Annotate each OriginalFeed object with the count of related ProcessedFeeds
         queryset = super().get_queryset(request)
-        queryset = queryset.annotate(_processed_feeds_count=Count('processed_feeds'))
+        queryset = queryset.annotate(_processed_feeds_count=_through_count(ProcessedFeed.feeds.through, 'originalfeed'))
         return queryset
 
     def processed_feeds_count(self, obj):
@@ -163,7 +248,7 @@ class OriginalFeedAdmin(admin.ModelAdmin):
     processed_feeds_count.short_description = 'Processed Feeds'
 
     # Filter if the original feed is included in the processed feed
-    list_filter = ('valid', 'processed_feeds__name', IncludedInProcessedFeedListFilter, 'tags')
+    list_filter = ('valid', ProcessedFeedNameListFilter, IncludedInProcessedFeedListFilter, 'tags')
     actions = [clean_selected_feeds_articles]
     autocomplete_fields = ['tags']
 
@@ -194,17 +279,19 @@ class HasAnyOriginalFeedListFilter_Tag(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
+        # EXISTS on the through table avoids the LEFT JOIN through the m2m
+        has_feeds = Exists(OriginalFeed.tags.through.objects.filter(tag=OuterRef('pk')))
         if self.value() == 'yes':
-            return queryset.exclude(original_feeds=None)
+            return queryset.filter(has_feeds)
         if self.value() == 'no':
-            return queryset.filter(original_feeds=None)
+            return queryset.filter(~has_feeds)
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         # Annotate each Tag object with the count of related OriginalFeeds
         queryset = super().get_queryset(request)
-        queryset = queryset.annotate(_original_feed_count=Count('original_feeds'))
+        queryset = queryset.annotate(_original_feed_count=_through_count(OriginalFeed.tags.through, 'tag'))
         return queryset
     
     def original_feed_count(self, obj):
@@ -215,8 +302,12 @@ class TagAdmin(admin.ModelAdmin):
     list_filter = [HasAnyOriginalFeedListFilter_Tag]
     inlines = [OriginalFeedInline]
     search_fields = ['name']
+    show_full_result_count = False
+    paginator = PkCountPaginator
+    list_per_page = 50
 
 @admin.register(Digest)
 class DigestAdmin(admin.ModelAdmin):
     list_display = ['processed_feed', 'created_at', 'start_time']
+    list_select_related = ['processed_feed']
     search_fields = ['processed_feed__name']
\ No newline at end of file
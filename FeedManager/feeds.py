@@ -1,16 +1,88 @@
 from django.contrib.syndication.views import Feed
 from django.utils.feedgenerator import Rss201rev2Feed
 from django.shortcuts import get_object_or_404, Http404
-from django.http import HttpResponseForbidden
-from .models import ProcessedFeed, Article, Filter, AppSetting
+from django.http import HttpResponse, HttpResponseForbidden
+from .models import ProcessedFeed, OriginalFeed, Article, Filter, AppSetting
+from django.db.models import Count, Max, Prefetch, Q
 from django.utils import timezone
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+import hashlib
 import re
+from collections import namedtuple
 from django.urls import reverse
 from .models import AppSetting
-from .utils import passes_filters, match_content, generate_untitled, remove_control_characters
+from .utils import filter_articles, generate_untitled, remove_control_characters
+
+# Carries a digest through the item_* methods without building an Article
+DigestItem = namedtuple(
+    'DigestItem',
+    ['title', 'link', 'published_date', 'content', 'summary', 'summary_one_line'],
+    defaults=(None, None),
+)
 
 class ProcessedAtomFeed(Feed):
     feed_type = Rss201rev2Feed
+    # Readers may reuse a fetched feed for this long before polling again
+    cache_max_age = 300
+
+    def __call__(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        etag = quote_etag(self.get_etag(obj, request))
+        # Answer a poll for an unchanged feed before building any items
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            # One cache entry per feed, a new render replaces the previous version
+            cache_key = f'processed_feed:{obj.pk}'
+            cached = cache.get(cache_key)
+            if cached and cached['etag'] == etag:
+                response = HttpResponse(cached['content'], content_type=cached['content_type'])
+                response.headers['Last-Modified'] = cached['last_modified']
+            else:
+                feedgen = self.get_feed(obj, request)
+                response = HttpResponse(content_type=feedgen.content_type)
+                response.headers['Last-Modified'] = http_date(feedgen.latest_post_date().timestamp())
+                feedgen.write(response, 'utf-8')
+                cache.set(cache_key, {
+                    'etag': etag,
+                    'content': response.content,
+                    'content_type': response.headers['Content-Type'],
+                    'last_modified': response.headers['Last-Modified'],
+                }, timeout=self.cache_max_age)
+        response.headers['ETag'] = etag
+        patch_cache_control(response, max_age=self.cache_max_age)
+        return response
+
+    def get_etag(self, obj, request):
+        """
+        Fingerprint everything the rendered feed depends on, using a few small
+        queries instead of loading and rendering the articles.
+        Articles are only ever added, summarized once, or deleted, so their
+        count, highest id and summarized count change whenever the feed does.
+        """
+        feed_ids = [feed.id for feed in obj.feed_list]
+        articles = Article.objects.filter(original_feed_id__in=feed_ids).aggregate(
+            count=Count('id'),
+            latest=Max('id'),
+            summarized=Count('id', filter=Q(summarized=True)),
+        )
+        filters = [
+            (group.id, group.usage, group.relational_operator,
+             [(filter.id, filter.field, filter.match_type, filter.value) for filter in group.filters.all()])
+            for group in obj.filter_groups.all()
+        ]
+        digest = None
+        if obj.toggle_digest:
+            digest = obj.digests.order_by('-created_at').values_list('id', 'start_time', 'content').first()
+        state = (
+            # get_feed renders <language> from the active language
+            request.build_absolute_uri('/'), AppSetting.get_auth_code(), get_language(),
+            obj.name, obj.toggle_digest, obj.toggle_entries, obj.feed_group_relational_operator,
+            [(feed.id, feed.url) for feed in obj.feed_list], articles, filters, digest,
+        )
+        return hashlib.sha1(repr(state).encode()).hexdigest()
 
     def get_object(self, request, feed_id=None, feed_name=None):
         auth_code = request.GET.get('key', '')
@@ -19,10 +91,16 @@ class ProcessedAtomFeed(Feed):
         if expected_code and (not auth_code or auth_code != expected_code):
             raise Http404("You do not have permission to view this feed.")  # Raise Http404 instead of returning HttpResponseForbidden
 
+        # description(), items() and get_etag() share one query each for the
+        # original feeds and the filters
+        processed_feeds = ProcessedFeed.objects.prefetch_related(
+            Prefetch('feeds', queryset=OriginalFeed.objects.only('id', 'url'), to_attr='feed_list'),
+            'filter_groups__filters',
+        )
         if feed_id:
-            return get_object_or_404(ProcessedFeed, id=feed_id)
+            return get_object_or_404(processed_feeds, id=feed_id)
         elif feed_name:
-            return get_object_or_404(ProcessedFeed, name=feed_name)
+            return get_object_or_404(processed_feeds, name=feed_name)
 
     def title(self, obj):
         return obj.name
@@ -40,44 +118,41 @@ class ProcessedAtomFeed(Feed):
         return self.link(obj)
 
     def description(self, obj):
-        original_feeds = ', '.join([feed.url for feed in obj.feeds.all()])
-        return f"Processed feed combining these original feeds: {original_feeds}, with {obj.filter_groups.count()} filter groups. All rights of the content belong to the original authors."
+        original_feeds = ', '.join(feed.url for feed in obj.feed_list)
+        return f"Processed feed combining these original feeds: {original_feeds}, with {len(obj.filter_groups.all())} filter groups. All rights of the content belong to the original authors."
 
 
     def items(self, obj):
-        result_items = []
+        # A generator: get_feed walks the items once, so nothing is collected here
         if obj.toggle_digest:
             # Get the most recent digest
             digest = obj.digests.order_by('-created_at').first()
             if digest:
-                digest_article = Article(
+                digest_article = DigestItem(
                     title=f"Digest for {obj.name} {digest.start_time.strftime('%Y-%m-%d %H:%M:%S')} to {digest.created_at.strftime('%Y-%m-%d %H:%M:%S')}",
                     link=f"/admin/FeedManager/digest/{digest.id}/change/",
                     published_date=digest.created_at,
                     content=digest.content,
-                    summarized=True,
-                    custom_prompt=True
                 )
-                result_items.append(digest_article)
+                yield digest_article
 
         if obj.toggle_entries:
             articles = Article.objects.filter(
-                original_feed__in=obj.feeds.all()
-            ).order_by('-published_date')
-
-            filtered_articles = [article for article in articles if passes_filters(article, obj, 'feed_filter')]
+                original_feed_id__in=[feed.id for feed in obj.feed_list]
+            )
+            # The feed filters run in the database instead of per article in Python
+            articles = filter_articles(articles, obj, 'feed_filter').order_by('-published_date')
+            # Only the columns the item_* methods read
+            articles = articles.only('title', 'link', 'published_date', 'content', 'summary', 'summary_one_line')
 
             seen = set()
-            unique_articles = []
-            for article in filtered_articles:
+            # Stream the rows; only the links seen so far are kept in memory
+            for article in articles.iterator(chunk_size=500):
                 # 由于是数据库中的已经 clean 过的 URL，所以不需要再次 clean
                 identifier = article.link
                 if identifier not in seen:
                     seen.add(identifier)
-                    unique_articles.append(article)
-            result_items.extend(unique_articles)
-
-        return result_items
+                    yield article
 
     def item_title(self, item):
         return remove_control_characters(item.title)
@@ -88,13 +163,15 @@ class ProcessedAtomFeed(Feed):
     def item_description(self, item):
         # if there is no summary, use the content,
         # otherwise use the summary and content together
-        description = remove_control_characters(item.content)
-        if item.summary:
-            formatted_summary = f"{item.summary}<br/>"
-            description = f"<br/><br/>{formatted_summary}<br/>Original Content:<br/>{item.content}"
+        content = remove_control_characters(item.content)
+        parts = []
         if item.summary_one_line:
-            description = f"{item.summary_one_line}<br/>{description}"
-        return description
+            parts += [item.summary_one_line, '<br/>']
+        if item.summary:
+            parts += ['<br/><br/>', item.summary, '<br/><br/>Original Content:<br/>', content]
+        else:
+            parts.append(content)
+        return ''.join(parts)
 
     def item_link(self, item):
         # 直接返回文章的原始链接，假设每篇文章都有一个URL字段
@@ -17,14 +17,13 @@ class Command(BaseCommand):
             except OriginalFeed.DoesNotExist:
                 raise CommandError(f'OriginalFeed "{feed_id}" does not exist')
         else:
-            feeds = OriginalFeed.objects.all()
+            feeds = OriginalFeed.objects.only('id', 'title', 'max_articles_to_keep')
             for feed in feeds:
                 self.clean_feed_articles(feed)
 
     def clean_feed_articles(self, feed):
-        article_count = Article.objects.filter(original_feed=feed).count()
-        if article_count > feed.max_articles_to_keep:
-            excess = article_count - feed.max_articles_to_keep
-            articles_to_delete_ids = Article.objects.filter(original_feed=feed).order_by('published_date').values_list('id', flat=True)[:excess]
-            Article.objects.filter(id__in=list(articles_to_delete_ids)).delete()
-            self.stdout.write(self.style.SUCCESS(f'Deleted {excess} old articles from feed {feed.title}'))
+        # Everything past the newest max_articles_to_keep, removed with a single DELETE ... WHERE id IN (subquery)
+        excess_ids = Article.objects.filter(original_feed=feed).order_by('-published_date').values('id')[feed.max_articles_to_keep:]
+        deleted, _ = Article.objects.filter(id__in=excess_ids).delete()
+        if deleted:
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} old articles from feed {feed.title}'))
@@ -11,20 +11,33 @@ class Command(BaseCommand):
     help = 'Generate digest for each processed feed.'
 
     def add_arguments(self, parser):
-        parser.add_argument('-n', '--name', type=str, help='Name of the ProcessedFeed to update')
+        parser.add_argument('-n', '--name', type=str, nargs='+', help='Name(s) of the ProcessedFeed(s) to update')
         parser.add_argument('--force', action='store_true', help='Force digest generation for all feeds')
 
     def handle(self, *args, **options):
-        feed_name = options.get('name')
+        feed_names = options.get('name')
         force = options.get('force')
-        if feed_name:
-            try:
-                feed = ProcessedFeed.objects.get(name=feed_name)
-                logger.info(f'Generating digest for feed: {feed.name} at {timezone.now()}')
-                # if feed.toggle_digest: # This will disble force digest generation for a selected feed
-                self.gen_digest(feed, force)
-            except ProcessedFeed.DoesNotExist:
-                raise CommandError(f'ProcessedFeed with name {feed_name} does not exist.')
+        if feed_names:
+            # Look up all requested feeds in one query
+            feeds = list(ProcessedFeed.objects.filter(name__in=feed_names))
+            missing = set(feed_names) - {feed.name for feed in feeds}
+            if not feeds:
+                raise CommandError(f'ProcessedFeed with name {", ".join(sorted(missing))} does not exist.')
+            if missing:
+                # A feed may be renamed or deleted after a digest was queued, generate the rest anyway
+                logger.error(f'ProcessedFeed with name {", ".join(sorted(missing))} does not exist, skipping.')
+            failed = []
+            for feed in feeds:
+                try:
+                    logger.info(f'Generating digest for feed: {feed.name} at {timezone.now()}')
+                    # if feed.toggle_digest: # This will disble force digest generation for a selected feed
+                    self.gen_digest(feed, force)
+                except Exception as e:
+                    logger.error(f'Error generating digest for feed {feed.name}: {str(e)}')
+                    failed.append(feed.name)
+            if failed:
+                # Let the task retry, feeds that got their digest are skipped by the last_digest check
+                raise CommandError(f'Failed to generate digest for {", ".join(failed)}.')
         else:
             processed_feeds = ProcessedFeed.objects.filter(toggle_digest=True)
             for feed in processed_feeds:
@@ -49,10 +62,17 @@ class Command(BaseCommand):
                 original_feed__processed_feeds=feed,
                 published_date__gte=start_time,
                 published_date__lte=now
-            ).order_by('original_feed', '-published_date')
+            ).order_by('original_feed', '-published_date').values_list(
+                # Plain rows are enough to build the digest, skip creating Article instances
+                'title', 'link', 'content', 'summary', 'summary_one_line',
+                'original_feed_id', 'original_feed__url', 'original_feed__title',
+                named=True,
+            )
 #            logger.debug(f"  Found {articles.count()} articles for feed {feed.name}")
 #            logger.debug(articles[0].summary_one_line)
-            if not articles.exists():
+            # Evaluated once, format_digest and the AI digest reuse the rows
+            articles = list(articles)
+            if not articles:
                 logger.info(f"  No new articles for feed {feed.name} since last digest.")
                 return
             what_to_include = []
@@ -116,11 +136,11 @@ class Command(BaseCommand):
         if 'include_toc' in what_to_include or ('include_one_line_summary' in what_to_include and any(article.summary_one_line for article in articles)):
             digest_builder.append("<h2>Table of Content</h2>")
             for article in articles:
-                if current_feed != article.original_feed:
+                if current_feed != article.original_feed_id:
                     if current_feed:
                         digest_builder.append("<br/>")
-                    current_feed = article.original_feed
-                    digest_builder.append(f"<h3><a href='{current_feed.url}'>{current_feed.title}</a></h3>")
+                    current_feed = article.original_feed_id
+                    digest_builder.append(f"<h3><a href='{article.original_feed__url}'>{article.original_feed__title}</a></h3>")
                 digest_builder.append(f"<li><a href='{article.link}'>{article.title}</a></li>")
                 if article.summary_one_line:
                     digest_builder.append(f"{article.summary_one_line}")
@@ -130,12 +150,14 @@ class Command(BaseCommand):
         if 'include_content' in what_to_include or ('include_summary' in what_to_include and any(article.summary for article in articles)):
             digest_builder.append("<br/>")
             digest_builder.append("<h2>Details</h2>")
+            # Start the feed headings over for the details section
+            current_feed = None
             for article in articles:
-                if current_feed != article.original_feed:
+                if current_feed != article.original_feed_id:
                     if current_feed:
                         digest_builder.append("</br>")
-                    current_feed = article.original_feed
-                    digest_builder.append(f"<h3><a href='{current_feed.url}'>{current_feed.title}</a></h3>")
+                    current_feed = article.original_feed_id
+                    digest_builder.append(f"<h3><a href='{article.original_feed__url}'>{article.original_feed__title}</a></h3>")
                 digest_builder.append(f"<li><a href='{article.link}'>{article.title}</a></li>")
                 if 'include_toc' not in what_to_include and 'include_one_line_summary' in what_to_include and article.summary_one_line:
                     digest_builder.append(f"{article.summary_one_line}")
@@ -49,21 +49,28 @@ class Command(BaseCommand):
     help = 'Updates and processes RSS feeds based on defined schedules and filters.'
 
     def add_arguments(self, parser):
-        parser.add_argument('-n', '--name', type=str, help='Name of the ProcessedFeed to update')
+        parser.add_argument('-n', '--name', type=str, nargs='+', help='Name(s) of the ProcessedFeed(s) to update')
 
     def handle(self, *args, **options):
-        feed_name = options.get('name')
-        if feed_name:
-            try:
-                feed = ProcessedFeed.objects.get(name=feed_name)
-                logger.info(f'Processing single feed: {feed.name} at {timezone.now()}')
-                self.update_feed(feed)
-            except ProcessedFeed.DoesNotExist:
-                raise CommandError('ProcessedFeed "%s" does not exist' % feed_name)
-            except Exception as e:
-                logger.error(f'Error processing feed {feed_name}: {str(e)}')
+        feed_names = options.get('name')
+        if feed_names:
+            # Look up all requested feeds in one query
+            feeds = list(ProcessedFeed.objects.filter(name__in=feed_names).prefetch_related('filter_groups__filters'))
+            missing = set(feed_names) - {feed.name for feed in feeds}
+            if not feeds:
+                raise CommandError('ProcessedFeed "%s" does not exist' % '", "'.join(sorted(missing)))
+            if missing:
+                # A feed may be renamed or deleted after an update was queued, update the rest anyway
+                logger.error('ProcessedFeed "%s" does not exist, skipping' % '", "'.join(sorted(missing)))
+            for feed in feeds:
+                try:
+                    logger.info(f'Processing single feed: {feed.name} at {timezone.now()}')
+                    self.update_feed(feed)
+                except Exception as e:
+                    logger.error(f'Error processing feed {feed.name}: {str(e)}')
         else:
-            processed_feeds = ProcessedFeed.objects.all()
+            # passes_filters runs for every entry, load each feed's filters once
+            processed_feeds = ProcessedFeed.objects.prefetch_related('filter_groups__filters')
             for feed in processed_feeds:
                 try:
                     logger.info(f'Processing feed: {feed.name} at {timezone.now()}')
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('FeedManager', '0025_alter_filter_field'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['original_feed', '-published_date'], name='article_feed_pubdate_idx'),
+        ),
+    ]
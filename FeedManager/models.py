@@ -1,7 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.conf import settings
-from django.db.models.signals import m2m_changed
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.db.backends.signals import connection_created
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
 import re
@@ -10,10 +12,33 @@ from .tasks import async_update_feeds_and_digest
 class AppSetting(models.Model):
     auth_code = models.CharField(max_length=64, blank=True, null=True)
 
+    # Other worker processes, and changes made with queryset.update(), are only
+    # seen once the cached code expires
+    AUTH_CODE_CACHE_KEY = 'app_setting_auth_code'
+    AUTH_CODE_CACHE_TIMEOUT = 60
+
     @classmethod
     def get_auth_code(cls):
+        # Wrapped in a tuple so that "no auth code" (None) is cached too
+        return cache.get_or_set(cls.AUTH_CODE_CACHE_KEY, cls._load_auth_code, cls.AUTH_CODE_CACHE_TIMEOUT)[0]
+
+    @classmethod
+    def _load_auth_code(cls):
         instance = cls.objects.first()
-        return instance.auth_code if instance else None
+        return (instance.auth_code if instance else None,)
+
+@receiver([post_save, post_delete], sender=AppSetting)
+def clear_auth_code_cache(sender, **kwargs):
+    cache.delete(AppSetting.AUTH_CODE_CACHE_KEY)
+
+@receiver(connection_created)
+def set_sqlite_pragmas(sender, connection, **kwargs):
+    # WAL lets feed and admin reads run while the task worker is writing
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA cache_size=-64000')
 
 class OriginalFeed(models.Model):
     url = models.URLField(unique=True, help_text="URL of the Atom or RSS feed", max_length=2048)
@@ -162,6 +187,9 @@ class Article(models.Model):
     # The unique check should happen when adding articles to a ProcessedFeed
     class Meta:
         unique_together = ('link', 'original_feed')
+        indexes = [
+            models.Index(fields=['original_feed', '-published_date'], name='article_feed_pubdate_idx'),
+        ]
 
     def __str__(self):
         return self.title
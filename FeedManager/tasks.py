@@ -1,6 +1,6 @@
 from huey.contrib.djhuey import periodic_task, task
 from huey import crontab
-from django.core.management import call_command
+from django.core.management import call_command, CommandError
 from django.conf import settings
 import os
 import logging
@@ -48,9 +48,22 @@ def generate_digest_task():
 
 @task(retries=3)
 def async_update_feeds_and_digest(feed_name):
-    call_command('update_feeds', name=feed_name)
-    call_command('generate_digest', name=feed_name)
+    # Run the bulk task's body in this task instead of queueing another one
+    async_update_feeds_and_digest_bulk.call_local([feed_name])
 
 @task(retries=3)
-def clean_old_articles(feed_id):
-    call_command('clean_old_articles', feed=feed_id)
\ No newline at end of file
+def async_update_feeds_and_digest_bulk(feed_names):
+    # One task and one run of each command for a whole admin selection
+    if not feed_names:
+        return  # An empty name list would make the commands process every feed
+    call_command('update_feeds', name=feed_names)
+    call_command('generate_digest', name=feed_names)
+
+@task(retries=3)
+def clean_old_articles_bulk(feed_ids):
+    for feed_id in feed_ids:
+        try:
+            call_command('clean_old_articles', feed=feed_id)
+        except CommandError as e:
+            # The feed was deleted after the task was queued, clean the others
+            logger.error(f"Error in clean_old_articles: {str(e)}")
\ No newline at end of file
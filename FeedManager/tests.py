@@ -1,3 +1,85 @@
+import itertools
+from datetime import datetime
+from unittest import mock
+
+import pytz
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Article, Filter, FilterGroup, OriginalFeed, ProcessedFeed
+from .utils import filter_articles, passes_filters
+
+# A value per match type that some, but not all, of the articles below match
+FILTER_VALUES = {
+    'contains': ['art', 'Spam', 'x.com/1'],
+    'does_not_contain': ['art', 'x.com/1'],
+    'matches_regex': [r'^art \d+$', r'(?i)spam', r'x\.com/\d$'],
+    'does_not_match_regex': [r'^art', r'\.org'],
+    'shorter_than': ['6', '16'],
+    'longer_than': ['6', '16'],
+}
+
+class FilterArticlesTest(TestCase):
+    """filter_articles must select exactly the articles passes_filters accepts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Saving a ProcessedFeed queues an update task
+        with mock.patch('FeedManager.models.async_update_feeds_and_digest'):
+            cls.processed_feed = ProcessedFeed.objects.create(name='filtered')
+        original_feed = OriginalFeed.objects.create(url='http://example.com/rss')
+        cls.processed_feed.feeds.add(original_feed)
+        titles = ['art 1', 'art 22 Spam', 'SPAM', 'Ünïcode', '', '   ', 'a.b', 'x' * 40]
+        links = ['http://x.com/1', 'http://x.com/12', 'http://x.org/a', 'http://x.com/9',
+                 'http://x.com/1?p=2', 'http://x.org/art', 'http://x.com/', 'http://x.com/spam']
+        for i, (title, link) in enumerate(zip(titles, links)):
+            Article.objects.create(
+                original_feed=original_feed,
+                title=title,
+                link=link,
+                published_date=datetime(2024, 1, i + 1, tzinfo=pytz.UTC),
+                content=f'<p>art content {i}</p>',
+            )
+
+    def assertSameArticles(self):
+        articles = Article.objects.all()
+        expected = {article.pk for article in articles if passes_filters(article, self.processed_feed, 'feed_filter')}
+        selected = set(filter_articles(articles, self.processed_feed, 'feed_filter').values_list('pk', flat=True))
+        self.assertEqual(selected, expected)
+
+    def set_filters(self, feed_operator, groups):
+        self.processed_feed.feed_group_relational_operator = feed_operator
+        self.processed_feed.filter_groups.all().delete()
+        for relational_operator, filters in groups:
+            group = FilterGroup.objects.create(
+                processed_feed=self.processed_feed, usage='feed_filter', relational_operator=relational_operator
+            )
+            for field, match_type, value in filters:
+                Filter.objects.create(filter_group=group, field=field, match_type=match_type, value=value)
+
+    def test_no_filters(self):
+        self.set_filters('any', [])
+        self.assertSameArticles()
+
+    def test_single_filter(self):
+        for field, _ in Filter.FIELD_CHOICES:
+            for match_type, values in FILTER_VALUES.items():
+                for value in values:
+                    for group_operator, feed_operator in itertools.product(['all', 'any', 'none'], repeat=2):
+                        with self.subTest(field=field, match_type=match_type, value=value,
+                                          group_operator=group_operator, feed_operator=feed_operator):
+                            self.set_filters(feed_operator, [(group_operator, [(field, match_type, value)])])
+                            self.assertSameArticles()
+
+    def test_combined_groups(self):
+        title_filters = [('title', 'contains', 'art'), ('title', 'longer_than', '6')]
+        link_filters = [('link', 'matches_regex', r'x\.com'), ('title_or_content', 'does_not_contain', 'Spam')]
+        for first, second, feed_operator in itertools.product(['all', 'any', 'none'], repeat=3):
+            with self.subTest(first=first, second=second, feed_operator=feed_operator):
+                self.set_filters(feed_operator, [(first, title_filters), (second, link_filters)])
+                self.assertSameArticles()
+
+    def test_empty_group(self):
+        for group_operator, feed_operator in itertools.product(['all', 'any', 'none'], repeat=2):
+            with self.subTest(group_operator=group_operator, feed_operator=feed_operator):
+                self.set_filters(feed_operator, [(group_operator, [])])
+                self.assertSameArticles()